@@ -1,19 +1,31 @@
 from typing import Dict, Any, List
 
+# Default split of monthly income in whole percent; whatever is left over is net cash flow (5%).
+_FIXED_PCT = 50
+_VARIABLE_PCT = 25
+_SAVINGS_PCT = 20
+
+# Largest monthly income (dollars) accepted; keeps the cent conversion finite.
+_MAX_INCOME = 1e15
+
 def generate_blueprint(profile: Dict[str, Any], parsed_docs: List[Dict[str, Any]]) -> Dict[str, Any]:
     income = float(profile.get("monthlyIncome", 0) or 0)
+    if not -_MAX_INCOME <= income <= _MAX_INCOME:
+        raise ValueError(f"monthlyIncome must be between -{_MAX_INCOME:.0e} and {_MAX_INCOME:.0e}")
 
-    fixed = round(income * 0.50, 2)
-    variable = round(income * 0.25, 2)
-    savings_target = round(income * 0.20, 2)
-    net_cash_flow = round(income - fixed - variable - savings_target, 2)
+    # Integer cents keep the split exact (buckets round half-up); dollars are only produced for the response.
+    income_c = round(income * 100)
+    fixed_c = (income_c * _FIXED_PCT + 50) // 100
+    variable_c = (income_c * _VARIABLE_PCT + 50) // 100
+    savings_target_c = (income_c * _SAVINGS_PCT + 50) // 100
+    net_cash_flow_c = income_c - fixed_c - variable_c - savings_target_c
 
     return {
         "monthlyBudget": {
             "income": income,
-            "fixed": fixed,
-            "variable": variable,
-            "savingsTarget": savings_target,
-            "netCashFlow": net_cash_flow,
+            "fixed": fixed_c / 100,
+            "variable": variable_c / 100,
+            "savingsTarget": savings_target_c / 100,
+            "netCashFlow": net_cash_flow_c / 100,
         }
     }
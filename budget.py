@@ -1,144 +1,261 @@
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field, conlist
+from typing import Dict, Any, List, Optional, Tuple
+from decimal import Decimal
+from functools import lru_cache
+import heapq
+from math import fsum
+import msgspec
+import numpy as np
 
-class BudgetLineItem(BaseModel):
-    name: str = Field(..., min_length=1, max_length=80)
-    amount: float = Field(..., ge=0)
+# Upper bound for every money amount (dollars): cent conversions and sums stay finite,
+# and batch cents fit in int64.
+_MAX_AMOUNT = 1e15
 
-class BudgetRequest(BaseModel):
-    monthly_after_tax_income: float = Field(..., ge=0)
+# Only holds a str and a float, so it can never be part of a reference cycle; gc=False
+# keeps the (potentially hundreds of) items per request out of the cyclic GC entirely.
+class BudgetLineItem(msgspec.Struct, frozen=True, gc=False):
+    name: str
+    amount: float
 
-    fixed_expenses: List[BudgetLineItem] = Field(default_factory=list)
-    variable_expenses: List[BudgetLineItem] = Field(default_factory=list)
+    def __post_init__(self):
+        if not 1 <= len(self.name) <= 80:
+            raise ValueError("name must be between 1 and 80 characters")
+        if not 0 <= self.amount <= _MAX_AMOUNT:
+            raise ValueError(f"amount must be between 0 and {_MAX_AMOUNT:.0e}")
+
+class BudgetRequest(msgspec.Struct, frozen=True):
+    monthly_after_tax_income: float
+
+    fixed_expenses: List[BudgetLineItem] = msgspec.field(default_factory=list)
+    variable_expenses: List[BudgetLineItem] = msgspec.field(default_factory=list)
 
     # Optional strategy knobs
-    target_needs_pct: float = Field(default=0.50, ge=0, le=1)
-    target_wants_pct: float = Field(default=0.30, ge=0, le=1)
-    target_savings_pct: float = Field(default=0.20, ge=0, le=1)
+    target_needs_pct: float = 0.50
+    target_wants_pct: float = 0.30
+    target_savings_pct: float = 0.20
 
     # Optional goals (monthly amounts)
-    emergency_fund_goal: float = Field(default=0, ge=0)
-    debt_extra_payment_goal: float = Field(default=0, ge=0)
-    investing_goal: float = Field(default=0, ge=0)
+    emergency_fund_goal: float = 0
+    debt_extra_payment_goal: float = 0
+    investing_goal: float = 0
 
-def _sum_items(items: List[BudgetLineItem]) -> float:
-    return round(sum(i.amount for i in items), 2)
+    def __post_init__(self):
+        if not 0 <= self.monthly_after_tax_income <= _MAX_AMOUNT:
+            raise ValueError(f"monthly_after_tax_income must be between 0 and {_MAX_AMOUNT:.0e}")
+        if not 0 <= self.target_needs_pct <= 1:
+            raise ValueError("target_needs_pct must be between 0 and 1")
+        if not 0 <= self.target_wants_pct <= 1:
+            raise ValueError("target_wants_pct must be between 0 and 1")
+        if not 0 <= self.target_savings_pct <= 1:
+            raise ValueError("target_savings_pct must be between 0 and 1")
+        if not 0 <= self.emergency_fund_goal <= _MAX_AMOUNT:
+            raise ValueError(f"emergency_fund_goal must be between 0 and {_MAX_AMOUNT:.0e}")
+        if not 0 <= self.debt_extra_payment_goal <= _MAX_AMOUNT:
+            raise ValueError(f"debt_extra_payment_goal must be between 0 and {_MAX_AMOUNT:.0e}")
+        if not 0 <= self.investing_goal <= _MAX_AMOUNT:
+            raise ValueError(f"investing_goal must be between 0 and {_MAX_AMOUNT:.0e}")
 
-def _top_items(items: List[BudgetLineItem], n: int = 5) -> List[Dict[str, Any]]:
-    sorted_items = sorted(items, key=lambda x: x.amount, reverse=True)
-    return [{"name": i.name, "amount": round(i.amount, 2)} for i in sorted_items[:n]]
+class BudgetBatchPcts(msgspec.Struct, frozen=True):
+    needs: float = 0.50
+    wants: float = 0.30
+    savings: float = 0.20
 
-def compute_budget(req: BudgetRequest) -> Dict[str, Any]:
-    income = round(req.monthly_after_tax_income, 2)
+    def __post_init__(self):
+        if not (0 <= self.needs <= 1 and 0 <= self.wants <= 1 and 0 <= self.savings <= 1):
+            raise ValueError("pcts must be between 0 and 1")
+        # Keeps the exact int64 target arithmetic in compute_budget_batch from overflowing.
+        if max(_pct_ratio(self.needs)[1], _pct_ratio(self.wants)[1], _pct_ratio(self.savings)[1]) > 10**6:
+            raise ValueError("pcts must have at most 6 decimal places")
+
+# Bounds the work a single /budget/batch request can ask for.
+_MAX_BATCH_SCENARIOS = 10_000
+
+class BudgetBatchRequest(msgspec.Struct, frozen=True):
+    # Parallel arrays: scenario k is (income[k], fixed[k], variable[k]) with monthly totals.
+    income: List[float]
+    fixed: List[float]
+    variable: List[float]
+    pcts: BudgetBatchPcts = msgspec.field(default_factory=BudgetBatchPcts)
+
+    def __post_init__(self):
+        if not len(self.income) == len(self.fixed) == len(self.variable):
+            raise ValueError("income, fixed and variable must have the same length")
+        if len(self.income) > _MAX_BATCH_SCENARIOS:
+            raise ValueError(f"at most {_MAX_BATCH_SCENARIOS} scenarios per batch")
+        for values in (self.income, self.fixed, self.variable):
+            if values and not (0 <= min(values) and max(values) <= _MAX_AMOUNT):
+                raise ValueError(f"income, fixed and variable must be between 0 and {_MAX_AMOUNT:.0e}")
+
+_WEEKS_PER_MONTH_INV = 1.0 / 4.33
+
+# Static next_steps shared by every response (tuples encode as JSON arrays).
+_NEEDS_STEPS = (
+    "Review housing, utilities, insurance, debt payments for refinancing or reductions.",
+    "Check subscriptions that are billed as 'fixed' (phone, streaming, memberships).",
+)
+_WANTS_STEPS = (
+    "Cap discretionary categories (dining out, shopping, entertainment).",
+    "Set weekly limits and turn on spending alerts.",
+)
+_DEFICIT_STEPS = (
+    "Cut variable expenses first (subscriptions, dining, discretionary).",
+    "Then renegotiate fixed bills (insurance, phone/internet) or refinance high-interest debt.",
+    "If still short, consider increasing income (overtime, side income).",
+)
+_SURPLUS_STEPS = (
+    "Automate transfers on payday: emergency fund → debt → investing (in that order, generally).",
+    "Keep a small buffer in checking to prevent overdrafts.",
+)
+
+def _cents(amount: float) -> int:
+    return round(amount * 100)
+
+@lru_cache(maxsize=64)
+def _pct_ratio(pct: float) -> Tuple[int, int]:
+    # pct at its decimal value (0.3 -> 3/10, not the nearest binary fraction).
+    return Decimal(repr(pct)).as_integer_ratio()
+
+def _pct_of_cents(cents: int, pct: float) -> int:
+    # cents * pct rounded half-up to a whole cent, exactly.
+    num, den = _pct_ratio(pct)
+    return (cents * num * 2 + den) // (2 * den)
 
-    fixed_total = _sum_items(req.fixed_expenses)
-    variable_total = _sum_items(req.variable_expenses)
-    total_spend = round(fixed_total + variable_total, 2)
+def _pct_of_cents_array(cents: "np.ndarray", pct: float) -> "np.ndarray":
+    # Vectorized _pct_of_cents. Splitting cents by den keeps every int64 product small
+    # (den <= 10**6 is enforced by BudgetBatchPcts).
+    num, den = _pct_ratio(pct)
+    q, r = np.divmod(cents, den)
+    return q * num + (r * num * 2 + den) // (2 * den)
 
-    net_cash_flow = round(income - total_spend, 2)
+def _sum_items(items: List[BudgetLineItem]) -> int:
+    return _cents(fsum([i.amount for i in items]))
+
+def _sum_and_top(items: List[BudgetLineItem], n: int = 5) -> Tuple[int, List[Dict[str, Any]]]:
+    # One pass: collect amounts for an exact fsum (as in _sum_items) while keeping a bounded
+    # min-heap of the n largest items. The negated index breaks ties in favour of earlier
+    # items and keeps names out of comparisons.
+    amounts: List[float] = []
+    heap: List[Tuple[float, int, str]] = []
+    for idx, i in enumerate(items):
+        amount = i.amount
+        amounts.append(amount)
+        if len(heap) < n:
+            heapq.heappush(heap, (amount, -idx, i.name))
+        else:
+            heapq.heappushpop(heap, (amount, -idx, i.name))
+    top = [{"name": name, "amount": round(amount, 2)} for amount, _, name in sorted(heap, reverse=True)]
+    return _cents(fsum(amounts)), top
+
+def _budget_core(income_c: int, fixed_total_c: int, variable_total_c: int,
+                 needs_pct: float, wants_pct: float, savings_pct: float,
+                 em_goal_c: int, debt_goal_c: int, inv_goal_c: int) -> Tuple[int, ...]:
+    # Straight-line numeric kernel of compute_budget; every amount is in integer cents.
+    total_spend_c = fixed_total_c + variable_total_c
+    net_cash_flow_c = income_c - total_spend_c
 
     # Targets (classic 50/30/20, adjustable)
-    needs_target = round(income * req.target_needs_pct, 2)
-    wants_target = round(income * req.target_wants_pct, 2)
-    savings_target = round(income * req.target_savings_pct, 2)
+    needs_target_c = _pct_of_cents(income_c, needs_pct)
+    wants_target_c = _pct_of_cents(income_c, wants_pct)
+    savings_target_c = _pct_of_cents(income_c, savings_pct)
+
+    savings_actual_c = max(0, net_cash_flow_c)
+
+    # Goal allocation suggestion (if surplus exists)
+    # Priority: emergency fund, then debt extra, then investing (MVP default order)
+    remaining_c = savings_actual_c
+    em_c = min(em_goal_c, remaining_c)
+    remaining_c -= em_c
+    debt_c = min(debt_goal_c, remaining_c)
+    remaining_c -= debt_c
+    inv_c = min(inv_goal_c, remaining_c)
+    remaining_c -= inv_c
+
+    return (total_spend_c, net_cash_flow_c,
+            needs_target_c, wants_target_c, savings_target_c, savings_actual_c,
+            em_c, debt_c, inv_c, remaining_c)
+
+def compute_budget(req: BudgetRequest) -> Dict[str, Any]:
+    # All money is handled as integer cents; dollars are only produced for the response.
+    income_c = _cents(req.monthly_after_tax_income)
+
+    fixed_total_c = _sum_items(req.fixed_expenses)
+    variable_total_c, top_variable_items = _sum_and_top(req.variable_expenses, n=5)
+    (total_spend_c, net_cash_flow_c,
+     needs_target_c, wants_target_c, savings_target_c, savings_actual_c,
+     em_c, debt_c, inv_c, remaining_c) = _budget_core(
+        income_c, fixed_total_c, variable_total_c,
+        req.target_needs_pct, req.target_wants_pct, req.target_savings_pct,
+        _cents(req.emergency_fund_goal), _cents(req.debt_extra_payment_goal), _cents(req.investing_goal),
+    )
 
     # Simple classification assumption:
     # - fixed_expenses = "needs"
     # - variable_expenses = "wants/variable" (some are needs, but MVP keeps it simple)
-    needs_actual = fixed_total
-    wants_actual = variable_total
-    savings_actual = max(0.0, net_cash_flow)
+    needs_actual_c = fixed_total_c
+    wants_actual_c = variable_total_c
 
     # Guidance logic
     recommendations: List[Dict[str, Any]] = []
 
-    if req.target_needs_pct + req.target_wants_pct + req.target_savings_pct != 1:
+    pct_sum = req.target_needs_pct + req.target_wants_pct + req.target_savings_pct
+    if abs(pct_sum - 1.0) > 1e-9:
         recommendations.append({
             "type": "warning",
             "message": "Your target percentages do not add up to 100%. Consider using 0.50 / 0.30 / 0.20."
         })
 
     # Needs/Wants comparisons
-    if needs_actual > needs_target:
+    if needs_actual_c > needs_target_c:
         recommendations.append({
             "type": "needs_over_target",
-            "message": f"Fixed expenses are above target by ${round(needs_actual - needs_target, 2)}.",
-            "next_steps": [
-                "Review housing, utilities, insurance, debt payments for refinancing or reductions.",
-                "Check subscriptions that are billed as 'fixed' (phone, streaming, memberships)."
-            ]
+            "message": f"Fixed expenses are above target by ${(needs_actual_c - needs_target_c) / 100}.",
+            "next_steps": _NEEDS_STEPS
         })
 
-    if wants_actual > wants_target:
+    if wants_actual_c > wants_target_c:
         recommendations.append({
             "type": "wants_over_target",
-            "message": f"Variable spending is above target by ${round(wants_actual - wants_target, 2)}.",
-            "next_steps": [
-                "Cap discretionary categories (dining out, shopping, entertainment).",
-                "Set weekly limits and turn on spending alerts."
-            ],
-            "top_variable_items": _top_items(req.variable_expenses, n=5)
+            "message": f"Variable spending is above target by ${(wants_actual_c - wants_target_c) / 100}.",
+            "next_steps": _WANTS_STEPS,
+            "top_variable_items": top_variable_items
         })
 
     # Cash flow recommendations
-    if net_cash_flow < 0:
-        deficit = abs(net_cash_flow)
+    if net_cash_flow_c < 0:
+        deficit_c = -net_cash_flow_c
         recommendations.append({
             "type": "deficit",
-            "message": f"You are short by ${round(deficit, 2)} per month.",
-            "next_steps": [
-                "Cut variable expenses first (subscriptions, dining, discretionary).",
-                "Then renegotiate fixed bills (insurance, phone/internet) or refinance high-interest debt.",
-                "If still short, consider increasing income (overtime, side income)."
-            ],
+            "message": f"You are short by ${deficit_c / 100} per month.",
+            "next_steps": _DEFICIT_STEPS,
             "quick_math": {
-                "needed_cut_per_week": round(deficit / 4.33, 2)
+                "needed_cut_per_week": round(deficit_c * _WEEKS_PER_MONTH_INV) / 100
             }
         })
     else:
         recommendations.append({
             "type": "surplus",
-            "message": f"You have ${net_cash_flow} left after expenses.",
-            "next_steps": [
-                "Automate transfers on payday: emergency fund → debt → investing (in that order, generally).",
-                "Keep a small buffer in checking to prevent overdrafts."
-            ]
+            "message": f"You have ${net_cash_flow_c / 100} left after expenses.",
+            "next_steps": _SURPLUS_STEPS
         })
 
-    # Goal allocation suggestion (if surplus exists)
-    allocation_plan: Dict[str, Any] = {"emergency": 0, "debt_extra": 0, "investing": 0, "remaining_buffer": 0}
-    if net_cash_flow > 0:
-        remaining = net_cash_flow
-
-        # Priority: emergency fund, then debt extra, then investing (MVP default order)
-        em = min(req.emergency_fund_goal, remaining)
-        remaining = round(remaining - em, 2)
-
-        debt = min(req.debt_extra_payment_goal, remaining)
-        remaining = round(remaining - debt, 2)
-
-        inv = min(req.investing_goal, remaining)
-        remaining = round(remaining - inv, 2)
-
-        allocation_plan = {
-            "emergency": round(em, 2),
-            "debt_extra": round(debt, 2),
-            "investing": round(inv, 2),
-            "remaining_buffer": round(remaining, 2),
-        }
+    allocation_plan = {
+        "emergency": em_c / 100,
+        "debt_extra": debt_c / 100,
+        "investing": inv_c / 100,
+        "remaining_buffer": remaining_c / 100,
+    }
 
     return {
-        "income": income,
+        "income": income_c / 100,
         "totals": {
-            "fixed_total": fixed_total,
-            "variable_total": variable_total,
-            "total_spend": total_spend,
+            "fixed_total": fixed_total_c / 100,
+            "variable_total": variable_total_c / 100,
+            "total_spend": total_spend_c / 100,
         },
-        "net_cash_flow": net_cash_flow,
+        "net_cash_flow": net_cash_flow_c / 100,
         "targets": {
-            "needs_target": needs_target,
-            "wants_target": wants_target,
-            "savings_target": savings_target,
+            "needs_target": needs_target_c / 100,
+            "wants_target": wants_target_c / 100,
+            "savings_target": savings_target_c / 100,
             "target_pcts": {
                 "needs": req.target_needs_pct,
                 "wants": req.target_wants_pct,
@@ -146,11 +263,58 @@ def compute_budget(req: BudgetRequest) -> Dict[str, Any]:
             }
         },
         "actuals": {
-            "needs_actual": round(needs_actual, 2),
-            "wants_actual": round(wants_actual, 2),
-            "savings_actual": round(savings_actual, 2),
+            "needs_actual": needs_actual_c / 100,
+            "wants_actual": wants_actual_c / 100,
+            "savings_actual": savings_actual_c / 100,
         },
         "allocation_plan": allocation_plan,
         "recommendations": recommendations,
         "disclaimer": "Educational output only; not financial, tax, or legal advice."
     }
+
+def compute_budget_batch(req: BudgetBatchRequest) -> Dict[str, Any]:
+    # Vectorized counterpart of compute_budget's totals/targets for many what-if scenarios.
+    # Money is kept as integer cents (int64) like the scalar path.
+    income_c = np.rint(np.asarray(req.income, dtype=np.float64) * 100).astype(np.int64)
+    fixed_c = np.rint(np.asarray(req.fixed, dtype=np.float64) * 100).astype(np.int64)
+    variable_c = np.rint(np.asarray(req.variable, dtype=np.float64) * 100).astype(np.int64)
+
+    total_spend_c = fixed_c + variable_c
+    net_cash_flow_c = income_c - total_spend_c
+
+    needs_target_c = _pct_of_cents_array(income_c, req.pcts.needs)
+    wants_target_c = _pct_of_cents_array(income_c, req.pcts.wants)
+    savings_target_c = _pct_of_cents_array(income_c, req.pcts.savings)
+
+    deficit = net_cash_flow_c < 0
+    needed_cut_per_week_c = np.where(deficit, np.rint(-net_cash_flow_c * _WEEKS_PER_MONTH_INV), 0)
+
+    return {
+        "income": income_c / 100,
+        "totals": {
+            "fixed_total": fixed_c / 100,
+            "variable_total": variable_c / 100,
+            "total_spend": total_spend_c / 100,
+        },
+        "net_cash_flow": net_cash_flow_c / 100,
+        "targets": {
+            "needs_target": needs_target_c / 100,
+            "wants_target": wants_target_c / 100,
+            "savings_target": savings_target_c / 100,
+            "target_pcts": {
+                "needs": req.pcts.needs,
+                "wants": req.pcts.wants,
+                "savings": req.pcts.savings,
+            }
+        },
+        "actuals": {
+            "needs_actual": fixed_c / 100,
+            "wants_actual": variable_c / 100,
+            "savings_actual": np.maximum(net_cash_flow_c, 0) / 100,
+        },
+        "needs_over_target": fixed_c > needs_target_c,
+        "wants_over_target": variable_c > wants_target_c,
+        "deficit": deficit,
+        "needed_cut_per_week": needed_cut_per_week_c / 100,
+        "disclaimer": "Educational output only; not financial, tax, or legal advice."
+    }
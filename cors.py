@@ -0,0 +1,61 @@
+from typing import List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Public API policy: any origin, method and header, with credentials. Browsers reject
+# "*" together with credentials, so the request Origin is echoed back instead.
+_PREFLIGHT_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"access-control-max-age", b"600"),
+    (b"vary", b"Origin"),
+]
+_SIMPLE_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+]
+
+class PublicCORSMiddleware:
+    # Wildcard-only replacement for CORSMiddleware: answers preflights directly and
+    # tags other cross-origin responses, with no per-request policy evaluation.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin: Optional[bytes] = None
+        request_headers: Optional[bytes] = None
+        is_preflight = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                is_preflight = scope["method"] == "OPTIONS"
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if is_preflight:
+            headers = [(b"access-control-allow-origin", origin), *_PREFLIGHT_HEADERS]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"access-control-allow-origin", origin),
+                    *_SIMPLE_HEADERS,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
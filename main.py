@@ -1,39 +1,110 @@
-from budget import BudgetRequest, compute_budget
-from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from budget import BudgetBatchRequest, BudgetRequest, compute_budget, compute_budget_batch
+import os
+import re
+import msgspec
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing import Any, Dict, List
 
+from cors import PublicCORSMiddleware
 from ocr import ocr_and_extract
 from blueprint import generate_blueprint
 
-app = FastAPI(title="WealthOS AI MVP API")
+def _enc_hook(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise NotImplementedError(f"cannot encode {type(obj).__name__}")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+_ENCODER = msgspec.json.Encoder(enc_hook=_enc_hook)
+
+class MsgspecJSONResponse(JSONResponse):
+    # msgspec is already used for request decoding; its C encoder also serves responses
+    # (and NumPy arrays from /budget/batch) without FastAPI's deprecated ORJSONResponse.
+    def render(self, content: Any) -> bytes:
+        return _ENCODER.encode(content)
+
+app = FastAPI(title="WealthOS AI MVP API", default_response_class=MsgspecJSONResponse)
+
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+app.add_middleware(PublicCORSMiddleware)
 
 class BlueprintRequest(BaseModel):
     profile: Dict[str, Any]
     parsed_docs: List[Dict[str, Any]] = []
 
+# Core schema is built once at import; /blueprint validates the raw body against it directly.
+_BLUEPRINT_ADAPTER = TypeAdapter(BlueprintRequest)
+
 @app.get("/health")
 def health():
     return {"ok": True}
 
 @app.post("/upload")
 async def upload(file: UploadFile = File(...), doc_type: str = Form("other")):
-    data = await file.read()
-    return ocr_and_extract(data, file.filename, doc_type)
+    # The multipart parser already spooled the upload (in memory, rolling over to disk);
+    # hand that handle to OCR instead of reading the body into bytes. ocr_and_extract rewinds it.
+    return ocr_and_extract(file.file, file.filename, doc_type)
 
+# /blueprint and /budget are pure CPU work finishing well under a millisecond, so they run
+# directly on the event loop instead of FastAPI's threadpool. Keep them free of blocking I/O.
 @app.post("/blueprint")
-def blueprint(req: BlueprintRequest):
-    return generate_blueprint(req.profile, req.parsed_docs)
+async def blueprint(request: Request):
+    try:
+        req = _BLUEPRINT_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)])
+    try:
+        return generate_blueprint(req.profile, req.parsed_docs)
+    except ValueError as e:
+        raise RequestValidationError([{"type": "value_error", "loc": ("body", "profile", "monthlyIncome"), "msg": str(e), "input": req.profile.get("monthlyIncome")}])
+
+_MSGSPEC_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+_MSGSPEC_MISSING = re.compile(r"Object missing required field `([^`]+)`")
+
+def _msgspec_error(e: msgspec.ValidationError) -> Dict[str, Any]:
+    # Map msgspec's "<msg> - at `$.a[0].b`" onto FastAPI's {type, loc, msg} error entry.
+    msg, _, path = str(e).partition(" - at `")
+    loc: List[Any] = ["body"]
+    for key, idx in _MSGSPEC_PATH_PART.findall(path.rstrip("`")[1:]):
+        loc.append(key if key else int(idx))
+    missing = _MSGSPEC_MISSING.fullmatch(msg)
+    if missing:
+        return {"type": "missing", "loc": (*loc, missing.group(1)), "msg": "Field required"}
+    return {"type": "value_error", "loc": tuple(loc), "msg": msg}
+
+def _decode(body: bytes, type: Any) -> Any:
+    # Same 422 error shape as FastAPI's own body validation (and /blueprint).
+    try:
+        return msgspec.json.decode(body, type=type)
+    except msgspec.ValidationError as e:
+        raise RequestValidationError([_msgspec_error(e)])
+    except msgspec.DecodeError as e:
+        raise RequestValidationError([{"type": "json_invalid", "loc": ("body",), "msg": str(e)}])
 
 @app.post("/budget")
-def budget(req: BudgetRequest):
-    return compute_budget(req)
+async def budget(request: Request):
+    req = _decode(await request.body(), BudgetRequest)
+    return MsgspecJSONResponse(compute_budget(req))
+
+def _budget_batch(body: bytes) -> Dict[str, Any]:
+    return compute_budget_batch(_decode(body, BudgetBatchRequest))
+
+# Batches scale with input size (up to _MAX_BATCH_SCENARIOS), so decoding and the NumPy
+# work go to the threadpool rather than holding the event loop.
+@app.post("/budget/batch")
+async def budget_batch(request: Request):
+    return MsgspecJSONResponse(await run_in_threadpool(_budget_batch, await request.body()))
+
+if __name__ == "__main__":
+    # Production entrypoint, one worker per core. "auto" picks uvloop and httptools when
+    # installed (requirements.txt pulls both in; uvloop is skipped on Windows) and falls
+    # back to asyncio / h11 otherwise. Binds to localhost unless HOST is set.
+    uvicorn.run("main:app", host=os.environ.get("HOST", "127.0.0.1"), port=int(os.environ.get("PORT", "8000")),
+                loop="auto", http="auto", workers=os.cpu_count())
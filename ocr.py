@@ -1,12 +1,20 @@
-from typing import Dict, Any
+from typing import Any, BinaryIO, Dict
 
-def ocr_and_extract(file_bytes: bytes, filename: str, doc_type: str) -> Dict[str, Any]:
-    return {
-        "docType": doc_type,
-        "source": "stub",
-        "filename": filename,
-        "extracted": {
-            "note": "OCR not yet enabled. Connect AWS Textract/Google Vision."
-        },
-        "confidence": 0.0,
-    }
+# Shared stub response; callers get a shallow copy, the nested "extracted" dict is never mutated.
+_TEMPLATE: Dict[str, Any] = {
+    "docType": None,
+    "source": "stub",
+    "filename": None,
+    "extracted": {
+        "note": "OCR not yet enabled. Connect AWS Textract/Google Vision."
+    },
+    "confidence": 0.0,
+}
+
+def ocr_and_extract(file: BinaryIO, filename: str, doc_type: str) -> Dict[str, Any]:
+    # OCR clients (Textract/Vision) take the handle directly; rewind so they read from the start.
+    file.seek(0)
+    r = _TEMPLATE.copy()
+    r["docType"] = doc_type
+    r["filename"] = filename
+    return r
@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+def test_blueprint_rejects_income_that_overflows_cents():
+    r = client.post("/blueprint", json={"profile": {"monthlyIncome": 1e307}})
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", "profile", "monthlyIncome"]
+
+def test_blueprint_buckets_round_half_up_and_net_is_remainder():
+    r = client.post("/blueprint", json={"profile": {"monthlyIncome": 4321.17}})
+    assert r.status_code == 200
+    assert r.json()["monthlyBudget"] == {
+        "income": 4321.17,
+        "fixed": 2160.59,
+        "variable": 1080.29,
+        "savingsTarget": 864.23,
+        "netCashFlow": 216.06,
+    }
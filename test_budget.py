@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+def test_budget_rejects_amounts_that_overflow_cents():
+    for payload in (
+        {"monthly_after_tax_income": 1e307},
+        {"monthly_after_tax_income": 100, "fixed_expenses": [{"name": "rent", "amount": 1e307}]},
+        {"monthly_after_tax_income": 100, "emergency_fund_goal": 1e308},
+    ):
+        r = client.post("/budget", json=payload)
+        assert r.status_code == 422, payload
+
+def test_budget_targets_round_half_up():
+    r = client.post("/budget", json={"monthly_after_tax_income": 8979.09})
+    assert r.status_code == 200
+    targets = r.json()["targets"]
+    assert targets["needs_target"] == 4489.55
+    assert targets["wants_target"] == 2693.73
+    assert targets["savings_target"] == 1795.82
+
+def test_budget_zero_totals_are_floats():
+    r = client.post("/budget", json={"monthly_after_tax_income": 1000})
+    totals = r.json()["totals"]
+    assert totals == {"fixed_total": 0.0, "variable_total": 0.0, "total_spend": 0.0}
+    assert all(isinstance(v, float) for v in totals.values())
+
+def test_budget_allocation_cascade():
+    r = client.post("/budget", json={
+        "monthly_after_tax_income": 3000,
+        "fixed_expenses": [{"name": "rent", "amount": 1000}],
+        "variable_expenses": [{"name": "food", "amount": 10.1}, {"name": "fun", "amount": 20.2}],
+        "emergency_fund_goal": 500,
+        "debt_extra_payment_goal": 300,
+        "investing_goal": 5000,
+    })
+    body = r.json()
+    assert body["net_cash_flow"] == 1969.7
+    assert body["allocation_plan"] == {"emergency": 500.0, "debt_extra": 300.0, "investing": 1169.7, "remaining_buffer": 0.0}
+
+def test_budget_allocation_leaves_buffer_after_goals():
+    r = client.post("/budget", json={"monthly_after_tax_income": 1000, "emergency_fund_goal": 100, "investing_goal": 50})
+    assert r.json()["allocation_plan"] == {"emergency": 100.0, "debt_extra": 0.0, "investing": 50.0, "remaining_buffer": 850.0}
+
+def test_budget_deficit_quick_math():
+    r = client.post("/budget", json={
+        "monthly_after_tax_income": 2000,
+        "fixed_expenses": [{"name": "rent", "amount": 900}],
+        "variable_expenses": [{"name": "shopping", "amount": 1160}],
+    })
+    body = r.json()
+    assert body["net_cash_flow"] == -60.0
+    assert body["allocation_plan"] == {"emergency": 0.0, "debt_extra": 0.0, "investing": 0.0, "remaining_buffer": 0.0}
+    deficit = next(rec for rec in body["recommendations"] if rec["type"] == "deficit")
+    assert deficit["message"] == "You are short by $60.0 per month."
+    assert deficit["quick_math"] == {"needed_cut_per_week": 13.86}
+
+def test_budget_validation_errors_use_fastapi_shape():
+    r = client.post("/budget", json={"monthly_after_tax_income": 1, "fixed_expenses": [{"amount": 1}]})
+    assert r.status_code == 422
+    assert r.json()["detail"] == [{"type": "missing", "loc": ["body", "fixed_expenses", 0, "name"], "msg": "Field required"}]
+
+    r = client.post("/budget", json={"monthly_after_tax_income": "x"})
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", "monthly_after_tax_income"]
+
+def test_budget_malformed_json_is_422():
+    r = client.post("/budget", content=b"{bad", headers={"content-type": "application/json"})
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["type"] == "json_invalid"
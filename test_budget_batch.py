@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+def test_batch_computes_each_scenario():
+    r = client.post("/budget/batch", json={"income": [5000, 2000], "fixed": [2500, 900], "variable": [1000, 1160]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["net_cash_flow"] == [1500.0, -60.0]
+    assert body["deficit"] == [False, True]
+    assert body["needed_cut_per_week"] == [0.0, 13.86]
+
+def test_batch_rejects_amounts_that_overflow_cents():
+    r = client.post("/budget/batch", json={"income": [1e17, 1e300], "fixed": [0, 0], "variable": [0, 0]})
+    assert r.status_code == 422
+
+def test_batch_rejects_too_many_scenarios():
+    n = 10_001
+    r = client.post("/budget/batch", json={"income": [1] * n, "fixed": [0] * n, "variable": [0] * n})
+    assert r.status_code == 422
+
+def test_batch_targets_round_half_up():
+    r = client.post("/budget/batch", json={"income": [8979.09], "fixed": [0], "variable": [0]})
+    assert r.json()["targets"]["needs_target"] == [4489.55]
+
+def test_batch_rejects_pcts_beyond_six_decimals():
+    r = client.post("/budget/batch", json={"income": [1], "fixed": [0], "variable": [0], "pcts": {"needs": 0.1234567}})
+    assert r.status_code == 422